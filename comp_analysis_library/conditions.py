@@ -2,9 +2,10 @@ from nltk import Tree
 from typing import Tuple
 
 
-default_ignored_labels = ('ls', 'pos', '.', 'dt', ',')
-default_mult_labels = ('ex', 'cd', 'md', 'pdt', 'prp', 'prp$', 'rp', 'uh', 'to')
-default_adjective_labels = ('in', 'jj')
+# frozensets, since these are only ever used for membership checks on every node
+default_ignored_labels = frozenset({'ls', 'pos', '.', 'dt', ','})
+default_mult_labels = frozenset({'ex', 'cd', 'md', 'pdt', 'prp', 'prp$', 'rp', 'uh', 'to'})
+default_adjective_labels = frozenset({'in', 'jj'})
 
 
 def universal_true(*args) -> bool:
@@ -33,7 +34,7 @@ def right_tree_is_ignored(tree1: Tree, tree2: Tree, ignore_labels=default_ignore
 
 
 def is_adj_noun(tree1: Tree, tree2: Tree, adjective_labels=default_adjective_labels) -> bool:
-    return is_adjective(tree1) and is_noun(tree2)
+    return is_adjective(tree1, adjective_labels) and is_noun(tree2)
 
 
 def is_verb_noun(tree1: Tree, tree2: Tree) -> bool:
@@ -73,13 +74,9 @@ def is_noun(tree: Tree) -> bool:
 
 def is_adjective(tree: Tree, adjective_labels=default_adjective_labels) -> bool:
     label = tree.label()
-    if tree[0] is None or label is None:
-        return False
-    if label == '':
+    if tree[0] is None or not label:
         return False
-    if label.lower() in adjective_labels:
-        return True
-    return False
+    return label.lower() in adjective_labels
 
 
 def is_noun_verb_noun(tree1: Tree, tree2: Tree, tree3: Tree) -> bool:
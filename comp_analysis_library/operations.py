@@ -1,9 +1,10 @@
 from nltk import Tree
+import numpy as np
 
 import NLI_hyponomy_analysis.data_pipeline.matrix_operations.hyponymy_library as hl
 
 import NLI_hyponomy_analysis.comp_analysis_library.conditions as cond
-from typing import Callable, Iterable, Tuple
+from typing import Callable, Iterable, List, Tuple
 
 
 def add(tree1: Tree, tree2: Tree) -> Tree:
@@ -32,33 +33,18 @@ def mmult_s(tree1: Tree, tree2: Tree, tree3: Tree) -> Tree:
 
 def pairwise_product_with_ignored_labels(tree1: Tree, tree2: Tree,
                                          bivariate_operator: Callable[[Tree, Tree], Tree]=mult,
-                                         ignore_labels: Iterable[str]=('ls', 'pos', '.', 'dt', ',')) -> Tree:
-    if cond.is_ignored(tree1, ignore_labels):
-        if cond.is_ignored(tree2, ignore_labels):
-            return Tree(None, [None])
-        return tree2
-    if cond.is_ignored(tree2, ignore_labels):
-        return tree1
-
-    return bivariate_operator(tree1, tree2)
+                                         ignore_labels: Iterable[str]=cond.default_ignored_labels) -> Tree:
+    ignored_operation = _IGNORED_PAIR_OPERATIONS.get((cond.is_ignored(tree1, ignore_labels),
+                                                      cond.is_ignored(tree2, ignore_labels)), bivariate_operator)
+    return ignored_operation(tree1, tree2)
 
 
 def l2r_pairwise(*trees: Tuple[Tree],
                  bivariate_operator: Callable[[Tree, Tree], Tree]=pairwise_product_with_ignored_labels) -> Tree:
-    product = trees[0]
-    if len(trees) > 1:
-        for tree in trees[1:]:
-            if tree[0] is None:
-                if product[0] is None:
-                    product = Tree(None, [None])
-                    continue
-                continue
-            if product[0] is None:
-                product = tree
-                continue
-
-            product = bivariate_operator(tree, product)
-    return product
+    if len(trees) == 1:
+        return trees[0]
+
+    return __pairwise_product([tree for tree in trees if tree[0] is not None], bivariate_operator)
 
 
 def r2l_pairwise(*trees: Tuple[Tree],
@@ -67,18 +53,23 @@ def r2l_pairwise(*trees: Tuple[Tree],
     if len(trees) == 1:
         return trees[0]
 
-    product = trees[-1]
+    return __pairwise_product([tree for tree in reversed(trees) if tree[0] is not None], bivariate_operator)
+
 
-    for tree in reversed(trees[:-1]):
-        if tree[0] is None:
-            if product[0] is None:
-                product = Tree(None, [None])
-                continue
-            continue
-        if product[0] is None:
-            product = tree
-            continue
+def __pairwise_product(trees: List[Tree], bivariate_operator: Callable[[Tree, Tree], Tree]) -> Tree:
+    """ Folds bivariate_operator(tree, product) over trees in the given order.
+        Trees without a vector are filtered out by the caller, so the loop needs no None checks.
+        For an elementwise operator with 3+ vectors the fold is a single numpy reduction along the stacked vectors,
+        which runs in the same order, so the floating point result is identical. """
+    if not trees:
+        return Tree(None, [None])
 
+    if len(trees) > 2 and bivariate_operator in _ELEMENTWISE_REDUCTIONS:
+        reduction = _ELEMENTWISE_REDUCTIONS[bivariate_operator]
+        return Tree(None, [reduction(np.stack([tree[0] for tree in trees]), axis=0)])
+
+    product = trees[0]
+    for tree in trees[1:]:
         product = bivariate_operator(tree, product)
     return product
 
@@ -89,3 +80,14 @@ def right_only(tree1: Tree, tree2: Tree) -> Tree:
 
 def left_only(tree1: Tree, tree2: Tree) -> Tree:
     return tree1
+
+
+def neither(tree1: Tree, tree2: Tree) -> Tree:
+    return Tree(None, [None])
+
+
+# Keyed by (tree1 is ignored, tree2 is ignored). Pairs with neither tree ignored use the bivariate operator.
+_IGNORED_PAIR_OPERATIONS = {(True, True): neither, (True, False): right_only, (False, True): left_only}
+
+# Operators whose pairwise l2r/r2l product can be computed by a single numpy reduction
+_ELEMENTWISE_REDUCTIONS = {add: np.add.reduce, mult: np.multiply.reduce}
@@ -3,7 +3,7 @@ from __future__ import annotations
 import copy
 
 from nltk import Tree
-from functools import reduce
+from functools import lru_cache
 from NLI_hyponomy_analysis.comp_analysis_library.policies import Policy
 from typing import Callable
 import numpy as np
@@ -15,17 +15,89 @@ class ChildAlreadyExistsError(Exception):
         super(ChildAlreadyExistsError, self).__init__(self.message)
 
 
+def _parse_tree_string(tree_string: str) -> Tree:
+    """
+    Single pass bracket parser, equivalent to Tree.fromstring(tree_string, remove_empty_top_bracketing=False).
+    Splitting around the brackets is done by str methods, so no regex tokenizer runs per sentence.
+    """
+    tokens = tree_string.replace('(', ' ( ').replace(')', ' ) ').split()
+    stack = [(None, [])]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '(':
+            if len(stack) == 1 and stack[0][1]:
+                raise ValueError(f"Expected end-of-string after the first tree in: {tree_string}")
+            label = ''
+            if i + 1 < len(tokens) and tokens[i + 1] not in ('(', ')'):
+                i += 1
+                label = tokens[i]
+            stack.append((label, []))
+        elif token == ')':
+            if len(stack) == 1:
+                raise ValueError(f"Unmatched ')' in: {tree_string}")
+            label, children = stack.pop()
+            stack[-1][1].append(Tree(label, children))
+        else:
+            if len(stack) == 1:
+                raise ValueError(f"Expected '(' before {token} in: {tree_string}")
+            stack[-1][1].append(token)
+        i += 1
+
+    if len(stack) > 1:
+        raise ValueError(f"Expected ')' at end-of-string in: {tree_string}")
+    if not stack[0][1]:
+        raise ValueError(f"Expected '(' in: {tree_string}")
+    return stack[0][1][0]
+
+
 class ParseTree:
     def __init__(self, binary_parse_string, word_vectors, policy: Policy):
         self.data = self.pos_string_to_binary_tree(binary_parse_string)
         self.word_vectors = word_vectors
         self.policy = copy.deepcopy(policy)
+        self._leaf_cache: dict = self.word_vectors.batch_lookup(self.data.leaves())
 
     def __repr__(self):
         return self.data.__repr__()
 
     def evaluate(self) -> None:
-        self.data = self.__evaluate(self.data)
+        self._flatten()
+        self.data = self.__evaluate()
+        return None
+
+    def _flatten(self) -> None:
+        """
+        Flattens the nodes of self.data that need evaluating into parallel lists (structure of arrays), in post-order,
+        so every node comes after its children and the root is last.
+        Node i has label _labels[i], and its children are entries _first_child[i] to _first_child[i] + _n_children[i]
+        of _child_nodes and _child_leaves: _child_nodes holds the index of an evaluated child, or -1 for a leaf, which is
+        then held in _child_leaves.
+        """
+        parent_first = []
+        stack = [self.data]
+        while stack:
+            node = stack.pop()
+            parent_first.append(node)
+            stack.extend(child for child in node if self.__has_subtrees(child))
+        nodes = parent_first[::-1]
+        node_indices = {id(node): i for i, node in enumerate(nodes)}
+
+        self._labels = [node.label() for node in nodes]
+        self._first_child = []
+        self._n_children = []
+        self._child_nodes = []
+        self._child_leaves = []
+        for node in nodes:
+            self._first_child.append(len(self._child_nodes))
+            self._n_children.append(len(node))
+            for child in node:
+                if self.__has_subtrees(child):
+                    self._child_nodes.append(node_indices[id(child)])
+                    self._child_leaves.append(None)
+                else:
+                    self._child_nodes.append(-1)
+                    self._child_leaves.append(child)
         return None
 
     def tree_to_binary(self, tree):
@@ -37,8 +109,12 @@ class ParseTree:
         elif len(tree) == 1:
             return self.tree_to_binary(tree[0])
         else:
+            # Each child is converted exactly once; the left-nested accumulator is already binary.
             label = tree.label()
-            return reduce(lambda x, y: Tree(label, (self.tree_to_binary(x), self.tree_to_binary(y))), tree)
+            binary_tree = self.tree_to_binary(tree[0])
+            for child in tree[1:]:
+                binary_tree = Tree(label, (binary_tree, self.tree_to_binary(child)))
+            return binary_tree
 
     @classmethod
     def from_sentence(cls, sentence: str, word_vectors, policy: Policy, delimiter=' ', tags=None):
@@ -51,34 +127,47 @@ class ParseTree:
                 assert len(tags) == len(leaves), TypeError
                 leaves = [Tree(tag, [leaf]) for tag, leaf in zip(tags, leaves)]
             output.data = Tree("Root", leaves)
+            output._leaf_cache = word_vectors.batch_lookup(output.data.leaves())
             return output
         return ParseTree(sentence, word_vectors, policy)
 
-    def __evaluate(self, tree: Tree):
+    def __evaluate(self):
         """
-        We maintain a stack of parents.
+        Evaluates the flattened nodes in order, so every child is evaluated before its parent and no Python frame is
+        allocated per node.
         If all the children in the current node are leaves, we operate on tree1, tree2, tree3, ...
         """
-        tree_list = []
-        for child in tree:
-            if self.__tree_is_leaf(child):
-                tree_list.append(child)
-            else:
-                tree_list.append(self.__evaluate(child))
-
-        for i, subtree in enumerate(tree_list):
-            if isinstance(subtree, str):
-                print("SUBTREE IS STRING?:", subtree)
-                print("Full tree list:", tree_list)
-                print("tree given:", tree)
-                raise ZeroDivisionError
-            vector = subtree[0]
-
-            if isinstance(vector, str):
-                vector = self.word_vectors.safe_lookup(vector)
-            tree_list[i] = Tree(subtree.label(), [vector])
-
-        return self.policy.apply(tree.label(), *tree_list)
+        results = []
+        for i, label in enumerate(self._labels):
+            start = self._first_child[i]
+            end = start + self._n_children[i]
+            tree_list = [results[child_node] if child_node >= 0 else leaf
+                         for child_node, leaf in zip(self._child_nodes[start:end], self._child_leaves[start:end])]
+
+            for j, subtree in enumerate(tree_list):
+                if isinstance(subtree, str):
+                    print("SUBTREE IS STRING?:", subtree)
+                    print("Full tree list:", tree_list)
+                    print("label given:", label)
+                    raise ZeroDivisionError
+                vector = subtree[0]
+
+                if isinstance(vector, str):
+                    vector = self.__lookup(vector)
+                tree_list[j] = Tree(subtree.label(), [vector])
+
+            results.append(self.policy.apply(label, *tree_list))
+
+        return results[-1]
+
+    def __lookup(self, word: str) -> np.array:
+        """ Every leaf is looked up once on construction, so this should only miss if self.data was replaced. """
+        try:
+            return self._leaf_cache[word]
+        except KeyError:
+            vector = self.word_vectors.safe_lookup(word)
+            self._leaf_cache[word] = vector
+            return vector
 
     @staticmethod
     def __tree_is_leaf(tree: Tree):
@@ -88,8 +177,18 @@ class ParseTree:
         return False
 
     @staticmethod
+    def __has_subtrees(tree: Tree) -> bool:
+        """ Whether the child needs evaluating before its parent, i.e. it is neither a leaf nor a bare word. """
+        return isinstance(tree, Tree) and not ParseTree.__tree_is_leaf(tree)
+
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
     def pos_string_to_binary_tree(pos_string: str):
-        parsed_tree = Tree.fromstring(pos_string, remove_empty_top_bracketing=False)
+        """
+        Memoised, since many SNLI sentences share the same parse across examples and splits.
+        The returned tree is shared between calls, so it must not be mutated in place; evaluate() builds new trees.
+        """
+        parsed_tree = _parse_tree_string(pos_string)
         return parsed_tree
 
     def metric(self, parse_tree2: ParseTree, binary_metric: Callable[[np.array, np.array], float], default: float=0.0):
@@ -0,0 +1,48 @@
+import unittest
+from nltk import Tree
+from parse_tree import _parse_tree_string
+
+
+def nltk_parse(tree_string: str) -> Tree:
+    return Tree.fromstring(tree_string, remove_empty_top_bracketing=False)
+
+
+class ParseTreeString(unittest.TestCase):
+    def assert_matches_nltk(self, tree_string: str):
+        self.assertEqual(repr(_parse_tree_string(tree_string)), repr(nltk_parse(tree_string)))
+
+    def test_labelled_parse(self):
+        self.assert_matches_nltk("(ROOT (S (NP man) (VBZ plays) (NN piano)))")
+
+    def test_unlabelled_binary_parse(self):
+        self.assert_matches_nltk("( ( Two women ) ( ( are ( embracing ( while ( holding ( to ( go packages ) ) ) ) ) ) . ) )")
+
+    def test_unlabelled_single_word(self):
+        self.assert_matches_nltk("( ( ( a ) ) )")
+
+    def test_empty_brackets(self):
+        self.assert_matches_nltk("()")
+        self.assert_matches_nltk("( )")
+
+    def test_empty_subtree(self):
+        self.assert_matches_nltk("(S (NP) b)")
+
+    def test_label_after_whitespace(self):
+        self.assert_matches_nltk("( S (NP a))")
+        self.assert_matches_nltk("(S\n  (NP   a)\t(VP b))")
+
+    def test_flat_leaves(self):
+        self.assert_matches_nltk("(S a b c)")
+
+    def test_malformed_raises(self):
+        malformed = ("", "  ", "a", "(a", "a)", "(a))", "(a)(b)", "(a) b", "((a b) c")
+        for tree_string in malformed:
+            with self.subTest(tree_string=tree_string):
+                with self.assertRaises(ValueError):
+                    nltk_parse(tree_string)
+                with self.assertRaises(ValueError):
+                    _parse_tree_string(tree_string)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -425,6 +425,8 @@ def nli_test_policy(data_loader: SNLI_DataLoader_Unclean, data_name: str, policy
         k_e, k_a = snli_stats(data_loader, word_vectors, policy, batch_size)
         data_writer_k_e.append_lines(k_e)
         data_writer_k_a.append_lines(k_a)
+    data_writer_k_e.close()
+    data_writer_k_a.close()
 
     plot_stats_multi(f"data/compositional_analysis/{policy_name}/{data_name}/", policy_name)
 
@@ -464,6 +466,8 @@ def ks_test_policy(data_path: str, policy: Policy, policy_name: str, batch_size=
         k_e, k_a = ks_stats(data_loader, word_vectors, policy, tags, batch_size=batch_size)
         data_writer_k_e.append_lines(k_e)
         data_writer_k_a.append_lines(k_a)
+    data_writer_k_e.close()
+    data_writer_k_a.close()
 
     plot_stats_single(f"data/compositional_analysis/{policy_name}/KS2016/{ks_type}/", policy_name)
     return None
@@ -521,6 +525,8 @@ def sick_test_policy_all(policy: Policy, policy_name: str):
 
     data_writer_k_e.append_lines(k_e)
     data_writer_k_a.append_lines(k_a)
+    data_writer_k_e.close()
+    data_writer_k_a.close()
 
     plot_stats_multi(f"data/compositional_analysis/{policy_name}/SICK/", policy_name)
     return None
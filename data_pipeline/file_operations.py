@@ -1,14 +1,22 @@
 import json
 import csv
+import mmap
 import os
 import pickle
+import re
 import warnings
 
-from typing import List, Iterable, Any
+from typing import List, Iterable, Any, BinaryIO, Optional
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class InvalidPathError(Exception):
     """ When a path could never point to a file, e.g missing .extension"""
@@ -53,15 +61,46 @@ def file_path_extension(file_path: str) -> str:
 
 
 def count_file_lines(file_path: str) -> int:
-    with open(file_path, "r") as file:
-        data = file.read()
-
-    if len(data) == 0:
-        return 1
+    with open(file_path, "rb") as file:
+        return count_lines(file)
 
-    number_of_lines = sum(1 for line in data if line[-1] == '\n') + 1
 
-    return number_of_lines
+def count_lines(file: BinaryIO) -> int:
+    """ Number of newlines from the current position to the end of the file + 1, so an empty file is 1 line.
+        Leaves the file positioned at its end.
+        Files on disk over 8MB are memory mapped where madvise is available, otherwise read in 4MB binary chunks. """
+    try:
+        file_size = os.fstat(file.fileno()).st_size
+    except OSError:
+        # In memory files, e.g io.BytesIO, have no file descriptor to map.
+        file_size = 0
+
+    if file_size > (8 << 20) and hasattr(mmap, "MADV_SEQUENTIAL"):
+        return __count_newlines_mmap(file) + 1
+    return __count_newlines_chunked(file) + 1
+
+
+def __count_newlines_chunked(file: BinaryIO) -> int:
+    number_of_newlines = 0
+    buffer = file.read(1 << 22)
+    while buffer:
+        number_of_newlines += int(np.count_nonzero(np.frombuffer(buffer, dtype=np.uint8) == 0x0A))
+        buffer = file.read(1 << 22)
+    return number_of_newlines
+
+
+def __count_newlines_mmap(file: BinaryIO) -> int:
+    number_of_newlines = 0
+    position = file.tell()
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory_map:
+        memory_map.madvise(mmap.MADV_SEQUENTIAL)
+        data = np.frombuffer(memory_map, dtype=np.uint8)
+        for start in range(position, len(data), 1 << 22):
+            number_of_newlines += int(np.count_nonzero(data[start:start + (1 << 22)] == 0x0A))
+        # The mmap cannot be closed while numpy still holds a view of it.
+        del data
+    file.seek(0, os.SEEK_END)
+    return number_of_newlines
 
 
 def is_file(file_path: str) -> bool:
@@ -185,11 +224,25 @@ def parent_path_name(path: str) -> str:
 
 
 def trim_end_of_file_blank_line(file_path: str) -> None:
-    with open(file_path, 'r') as in_file:
-        data = in_file.read()
+    with open(file_path, 'r+b') as file:
+        trim_end_blank_line(file)
 
-    with open(file_path, 'w') as out_file:
-        out_file.write(data.rstrip('\n'))
+    return None
+
+
+def trim_end_blank_line(file: BinaryIO) -> None:
+    """ Truncates trailing newlines in place, only reading the tail of the file in 4KB steps. """
+    position = file.seek(0, os.SEEK_END)
+    while position > 0:
+        step = min(4096, position)
+        position -= step
+        file.seek(position)
+        chunk = file.read(step)
+        end = len(chunk.rstrip(b'\r\n'))
+        if end > 0:
+            file.truncate(position + end)
+            return None
+    file.truncate(0)
 
     return None
 
@@ -249,6 +302,9 @@ def save_print_decorator(func: callable) -> callable:
 
 class DictWriter:
     supported_file_extensions = ('.p', '.json')
+    # orjson silently loads integers outside the 64-bit range as floats, so integer literals of 19+ digits are left
+    # to json. Fraction and exponent digits of floats are not matched.
+    _long_integer_literal = re.compile(rb'(?<![\d.eE+-])-?\d{19,}(?![\d.eE])')
 
     def __init__(self, file_path: str):
         assert file_path_extension(file_path) in DictWriter.supported_file_extensions, InvalidPathError
@@ -299,10 +355,29 @@ class DictWriter:
         return None
 
     def __load_json(self) -> dict:
+        if orjson is not None:
+            try:
+                return self.__load_json_mmap()
+            except ValueError:
+                # orjson rejects the NaN/Infinity literals json.dump can write, empty files cannot be mapped,
+                # and integers that may not fit in 64 bits are refused before parsing.
+                pass
+
         with open(self.file_path, 'r') as json_file:
             data = json.load(json_file)
         return data
 
+    def __load_json_mmap(self) -> dict:
+        """ Parses the mapped file directly, without first reading it into a str.
+            Raises ValueError for any integer literal of 19+ digits, which orjson could load as a float instead of an int. """
+        with open(self.file_path, 'rb') as json_file:
+            with mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ) as memory_map:
+                if DictWriter._long_integer_literal.search(memory_map) is not None:
+                    raise ValueError(f"{self.file_path} may contain integers outside the 64-bit range")
+                with memoryview(memory_map) as buffer:
+                    data = orjson.loads(buffer)
+        return data
+
     def __save_json(self, data: dict) -> None:
         with open(self.file_path, 'w') as json_file:
             json.dump(data, json_file)
@@ -421,6 +496,8 @@ class TextLogger:
 
 class CSV_Writer:
     def __init__(self, file_path: str, header: Iterable=None, delimiter='|'):
+        # Opened lazily by append_lines and kept open, so repeated appends share one buffered handle.
+        self._append_file = None
         self.__assert_is_csv(file_path)
         self.file_path = file_path
         self.delimiter = delimiter
@@ -434,7 +511,11 @@ class CSV_Writer:
 
         self._batch_index = 0
 
+    def __del__(self):
+        self.close()
+
     def __len__(self):
+        self.flush()
         # Remove 1, due to the empty line @ EOF.
         return count_file_lines(self.file_path) - 1
 
@@ -444,8 +525,21 @@ class CSV_Writer:
 
     @property
     def file_empty(self):
+        self.flush()
         return self.file_exists and os.stat(self.file_path).st_size == 0
 
+    def flush(self) -> None:
+        """ Write any buffered appended lines to disk. Called before every read or overwrite of the file. """
+        if self._append_file is not None:
+            self._append_file.flush()
+        return None
+
+    def close(self) -> None:
+        if self._append_file is not None:
+            self._append_file.close()
+            self._append_file = None
+        return None
+
     @load_print_decorator
     def load_line(self, line_number: int) -> list:
         """ For efficiently loading a specific line number """
@@ -538,21 +632,24 @@ class CSV_Writer:
         return None
 
     def write_dataframe(self, data: pd.DataFrame):
+        self.flush()
         data_header = data.columns.values.tolist()
         self.header = data_header
         data.to_csv(self.file_path, sep=self.delimiter, index=False, header=True)
         return None
 
     def append_lines(self, lines: list) -> None:
-        if not self.file_exists or self.file_empty:
+        if self._append_file is None and (not self.file_exists or self.file_empty):
             self.__save(lines)
         else:
             if self.__lines_are_empty(lines):
                 return None
 
-            with open(self.file_path, 'a') as file:
-                for line in lines:
-                    file.write(self.delimiter.join(line) + '\n')
+            if self._append_file is None:
+                self._append_file = open(self.file_path, 'a', buffering=1 << 20)
+
+            for line in lines:
+                self._append_file.write(self.delimiter.join(line) + '\n')
         return None
 
     def remove_last_line(self) -> None:
@@ -569,6 +666,7 @@ class CSV_Writer:
         return None
 
     def __load(self) -> pd.DataFrame:
+        self.flush()
         if self.header is None:
             data = pd.read_csv(self.file_path, sep=self.delimiter, header=None)
             return data
@@ -576,21 +674,47 @@ class CSV_Writer:
         return data
 
     def __load_as_list(self, as_float=False) -> list:
+        self.flush()
+        data = self.__load_rectangular_rows()
+        if data is None:
+            data = self.__load_rows()
+
+        if as_float:
+            data = [[float(element) for element in row] for row in data]
+        return data
+
+    def __load_rectangular_rows(self) -> Optional[List[list]]:
+        """ Fast path: the C parser fills the whole table at once, rather than building each row in Python.
+            Returns None if the file is not a rectangular table of non-empty fields, since pandas would pad short rows,
+            fill blank lines or reject long rows, where csv.reader returns each row as written. """
+        # The header row is skipped rather than parsed, since it may have fewer columns than the data rows.
+        # Only empty fields are parsed as NaN, so any NaN marks an empty field, a short row or a blank line.
+        try:
+            data = pd.read_csv(self.file_path, sep=self.delimiter, header=None, skiprows=int(self.header is not None),
+                               dtype=str, engine='c', keep_default_na=False, na_values=[''], skip_blank_lines=False)
+        except pd.errors.EmptyDataError:
+            return []
+        except pd.errors.ParserError:
+            return None
+
+        if data.isna().values.any():
+            return None
+        return data.values.tolist()
+
+    def __load_rows(self) -> List[list]:
         with open(self.file_path, 'r') as file:
             csv_reader = csv.reader(file, delimiter=self.delimiter)
             if self.header is not None:
-                next(csv_reader)
-
-            if as_float:
-                data = [[float(element) for element in row] for row in csv_reader]
-            else:
-                data = [row for row in csv_reader]
+                next(csv_reader, None)
+            data = [row for row in csv_reader]
         return data
 
     def __save(self, lines: list) -> None:
         if self.__lines_are_empty(lines):
             return None
 
+        self.flush()
+
         rows_to_write = [*lines]
         if self.header is not None:
             rows_to_write = [list(self.header)] + rows_to_write
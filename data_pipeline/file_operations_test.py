@@ -1,4 +1,6 @@
+import io
 import os
+import random
 import unittest
 
 import pandas as pd
@@ -22,24 +24,18 @@ class TestTeardownFile:
         self.__delete()
 
 
-def make_blank_file(file_path: str, num_lines_non_blank: int, num_lines_blank: int) -> None:
+def make_blank_bytes(num_lines_non_blank: int, num_lines_blank: int) -> bytes:
     if num_lines_non_blank == 0:
-        lines = ['\n' for _ in range(num_lines_blank - 1)]
-
-        with open(file_path, 'w') as out_file:
-            out_file.writelines(lines)
+        body = '\n' * (num_lines_blank - 1)
+    else:
+        body = "test\n" * (num_lines_non_blank - 1) + ("test" if num_lines_non_blank > 1 else '') + '\n' * num_lines_blank
 
-        return None
+    return body.encode()
 
-    lines = ["test\n" for _ in range(num_lines_non_blank - 1)]
-    if num_lines_non_blank > 1:
-        lines += "test"
 
-    if num_lines_blank > 0:
-        lines += ['\n' for _ in range(num_lines_blank)]
-
-    with open(file_path, 'w') as out_file:
-        out_file.writelines(lines)
+def make_blank_file(file_path: str, num_lines_non_blank: int, num_lines_blank: int) -> None:
+    with open(file_path, 'wb') as out_file:
+        out_file.write(make_blank_bytes(num_lines_non_blank, num_lines_blank))
 
     return None
 
@@ -73,141 +69,222 @@ class TestFilePathOfExtension(unittest.TestCase):
 
 class TestCountLines(unittest.TestCase):
     def test_blank1(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 2)
-            self.assertEqual(12, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 2))
+        self.assertEqual(12, file_op.count_lines(file))
 
     def test_blank2(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 1)
-            self.assertEqual(11, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 1))
+        self.assertEqual(11, file_op.count_lines(file))
 
     def test_blank3(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 0)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(10, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 0))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(10, file_op.count_lines(file))
 
     def test_blank4(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 1, 2)
-            self.assertEqual(3, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(1, 2))
+        self.assertEqual(3, file_op.count_lines(file))
 
     def test_blank5(self):
+        file = io.BytesIO(make_blank_bytes(1, 1))
+        self.assertEqual(2, file_op.count_lines(file))
+
+    def test_blank6(self):
+        file = io.BytesIO(make_blank_bytes(0, 1))
+        self.assertEqual(1, file_op.count_lines(file))
+
+    def test_blank7(self):
+        file = io.BytesIO(make_blank_bytes(0, 0))
+        self.assertEqual(1, file_op.count_lines(file))
+
+    def test_file_path(self):
         test_path = "test.txt"
 
         with TestTeardownFile(test_path):
-            make_blank_file(test_path, 1, 1)
-            self.assertEqual(2, file_op.count_file_lines(test_path))
+            make_blank_file(test_path, 10, 2)
+            self.assertEqual(12, file_op.count_file_lines(test_path))
 
-    def test_blank6(self):
+    def test_counts_from_current_position(self):
+        file = io.BytesIO(b"a\nb\nc\n")
+        file.readline()
+        self.assertEqual(3, file_op.count_lines(file))
+
+    def test_buffered_file_counts_from_current_position(self):
         test_path = "test.txt"
 
-        # with TestTeardown(test_path):
-        make_blank_file(test_path, 0, 1)
-        self.assertEqual(1, file_op.count_file_lines(test_path))
+        with TestTeardownFile(test_path):
+            with open(test_path, "wb") as file:
+                file.write(b"a\nb\nc\n")
 
-    def test_blank7(self):
+            with open(test_path, "rb") as file:
+                file.readline()
+                self.assertEqual(3, file_op.count_lines(file))
+
+    def test_memory_mapped_file_counts_from_current_position(self):
         test_path = "test.txt"
+        number_of_lines = (9 << 20) // 8
 
         with TestTeardownFile(test_path):
-            make_blank_file(test_path, 0, 0)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+            with open(test_path, "wb") as file:
+                file.write(b"0123456\n" * number_of_lines)
+
+            with open(test_path, "rb") as file:
+                file.readline()
+                self.assertEqual(number_of_lines, file_op.count_lines(file))
 
 
 class TestTrimEmptyLines(unittest.TestCase):
     """ Relies on TestCountLines to pass all tests."""
 
     def test_blank1(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 2)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(10, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 2))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(10, file_op.count_lines(file))
 
     def test_blank2(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 1)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(10, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 1))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(10, file_op.count_lines(file))
 
     def test_blank3(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 0)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(10, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(10, 0))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(10, file_op.count_lines(file))
 
     def test_blank4(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 1, 2)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(1, 2))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_blank5(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 1, 1)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(1, 1))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_blank6(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 1, 0)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(1, 0))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_blank7(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 0, 2)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(0, 2))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_blank8(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 0, 1)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(0, 1))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_blank9(self):
-        test_path = "test.txt"
-
-        with TestTeardownFile(test_path):
-            make_blank_file(test_path, 0, 0)
-            file_op.trim_end_of_file_blank_line(test_path)
-            self.assertEqual(1, file_op.count_file_lines(test_path))
+        file = io.BytesIO(make_blank_bytes(0, 0))
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(1, file_op.count_lines(file))
 
     def test_double_trim(self):
+        file = io.BytesIO(make_blank_bytes(10, 5))
+        file_op.trim_end_blank_line(file)
+        file_op.trim_end_blank_line(file)
+        file.seek(0)
+        self.assertEqual(10, file_op.count_lines(file))
+
+    def test_file_path(self):
         test_path = "test.txt"
 
         with TestTeardownFile(test_path):
-            make_blank_file(test_path, 10, 5)
-            file_op.trim_end_of_file_blank_line(test_path)
+            make_blank_file(test_path, 10, 2)
             file_op.trim_end_of_file_blank_line(test_path)
             self.assertEqual(10, file_op.count_file_lines(test_path))
 
 
+class TestDictWriter(unittest.TestCase):
+    test_path = "test_dict_writer.json"
+
+    def load_json_both_ways(self) -> tuple:
+        """ Returns (orjson result, stdlib json result) """
+        data_fast = file_op.DictWriter(self.test_path).load()
+
+        orjson = file_op.orjson
+        file_op.orjson = None
+        try:
+            data_stdlib = file_op.DictWriter(self.test_path).load()
+        finally:
+            file_op.orjson = orjson
+        return data_fast, data_stdlib
+
+    def test_load_json_matches_stdlib(self):
+        data = {"a": [0.5, -1.25e-7, 3], "b": "text", "c": {"d": [[1, 2], [3, 4]]}}
+
+        with TestTeardownFile(self.test_path):
+            file_op.DictWriter(self.test_path).save(data)
+            data_fast, data_stdlib = self.load_json_both_ways()
+            self.assertEqual(data_fast, data_stdlib)
+            self.assertEqual(data_fast, data)
+
+    def test_load_json_floats_skip_stdlib(self):
+        random.seed(0)
+
+        def json_load_not_called(*args, **kwargs):
+            raise AssertionError("Expected the orjson path to load the file")
+
+        with TestTeardownFile(self.test_path):
+            for scale in (1, 0.1, 0.01, 1e-3):
+                data = {str(i): [[random.random() * scale for _ in range(25)] for _ in range(25)] for i in range(4)}
+                file_op.DictWriter(self.test_path).save(data)
+
+                json_load = file_op.json.load
+                file_op.json.load = json_load_not_called
+                try:
+                    data_fast = file_op.DictWriter(self.test_path).load()
+                finally:
+                    file_op.json.load = json_load
+                self.assertEqual(data_fast, data)
+
+    def test_load_json_keeps_big_integers(self):
+        data = {"big": 10**30, "small": -2**64, "max": 2**64 - 1}
+
+        with TestTeardownFile(self.test_path):
+            file_op.DictWriter(self.test_path).save(data)
+            data_fast, data_stdlib = self.load_json_both_ways()
+            self.assertEqual(data_fast, data_stdlib)
+            self.assertEqual(data_fast, data)
+            self.assertIsInstance(data_fast["big"], int)
+
+    def test_load_json_nan(self):
+        data = {"a": [float("nan"), float("inf"), 1.0]}
+
+        with TestTeardownFile(self.test_path):
+            file_op.DictWriter(self.test_path).save(data)
+            data_fast, data_stdlib = self.load_json_both_ways()
+            self.assertTrue(np.isnan(data_fast["a"][0]))
+            self.assertEqual(data_fast["a"][1:], data_stdlib["a"][1:])
+            self.assertEqual(data_fast["a"][1:], [float("inf"), 1.0])
+
+    def test_load_json_empty_file(self):
+        with TestTeardownFile(self.test_path):
+            file_op.make_empty_file(self.test_path)
+            with self.assertRaises(ValueError):
+                file_op.DictWriter(self.test_path).load()
+
+            orjson = file_op.orjson
+            file_op.orjson = None
+            try:
+                with self.assertRaises(ValueError):
+                    file_op.DictWriter(self.test_path).load()
+            finally:
+                file_op.orjson = orjson
+
+
 class TestCSV_Writer(unittest.TestCase):
     test_path = "test_csv_writer.csv"
 
@@ -267,6 +344,43 @@ class TestCSV_Writer(unittest.TestCase):
             correct_data = data_initial*3
             print(correct_data)
             self.assertEqual(loaded_data, correct_data)
+            csv_writer.close()
+
+    def test_append_lines_written_on_close(self):
+        data_initial = [[str(i) for i in range(2)] for _ in range(2)]
+        header = ("col1", "col2")
+
+        with TestTeardownFile(self.test_path):
+            csv_writer = file_op.CSV_Writer(self.test_path, header)
+            csv_writer.write(data_initial)
+
+            csv_writer.append_lines(data_initial)
+            csv_writer.close()
+
+            self.assertEqual(file_op.count_file_lines(self.test_path), 6)
+            self.assertEqual(file_op.CSV_Writer(self.test_path, header).load_all(), data_initial*2)
+
+    def test_append_lines_buffered_until_flush(self):
+        data_initial = [[str(i) for i in range(2)] for _ in range(2)]
+        header = ("col1", "col2")
+
+        with TestTeardownFile(self.test_path):
+            csv_writer = file_op.CSV_Writer(self.test_path, header)
+            csv_writer.write(data_initial)
+            size_initial = os.path.getsize(self.test_path)
+
+            for _ in range(3):
+                csv_writer.append_lines(data_initial)
+            self.assertEqual(os.path.getsize(self.test_path), size_initial)
+
+            csv_writer.flush()
+            self.assertEqual(file_op.count_file_lines(self.test_path), 10)
+
+            csv_writer.append_lines(data_initial)
+            self.assertEqual(file_op.count_file_lines(self.test_path), 10)
+
+            csv_writer.close()
+            self.assertEqual(file_op.count_file_lines(self.test_path), 12)
 
     def test_append_empty_lines_does_nothing(self):
         data = [[]]
@@ -327,6 +441,7 @@ class TestCSV_Writer(unittest.TestCase):
             loaded_data = csv_writer.load_all()
             self.assertEqual(data_initial*3, loaded_data)
             self.assertTrue(file_op.count_file_lines(self.test_path), 5)
+            csv_writer.close()
 
     def test_write_dataframe_adds_header(self):
         data = pd.DataFrame.from_dict({"col1": [0, 0], "col2": [1, 1]})
@@ -479,6 +594,59 @@ class TestCSV_Writer(unittest.TestCase):
             correct_data = data_initial * 3
             print(correct_data)
             self.assertEqual(loaded_data, correct_data)
+            csv_writer.close()
+
+    def test_load_all_keeps_blank_lines(self):
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("0|1\n\n2|3\n")
+
+            csv_writer = file_op.CSV_Writer(self.test_path)
+            self.assertEqual(csv_writer.load_all(), [['0', '1'], [], ['2', '3']])
+
+    def test_load_all_keeps_short_rows(self):
+        header = ("col1", "col2")
+
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("col1|col2\n0|1\n2\n")
+
+            csv_writer = file_op.CSV_Writer(self.test_path, header)
+            self.assertEqual(csv_writer.load_all(), [['0', '1'], ['2']])
+
+    def test_load_all_keeps_long_rows(self):
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("0|1\n2|3|4\n")
+
+            csv_writer = file_op.CSV_Writer(self.test_path)
+            self.assertEqual(csv_writer.load_all(), [['0', '1'], ['2', '3', '4']])
+
+    def test_load_all_keeps_empty_fields(self):
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("0|\n2|3\n")
+
+            csv_writer = file_op.CSV_Writer(self.test_path)
+            self.assertEqual(csv_writer.load_all(), [['0', ''], ['2', '3']])
+
+    def test_load_all_as_float_with_nan(self):
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("0.5|nan\n2|3\n")
+
+            loaded_data = file_op.CSV_Writer(self.test_path).load_all(as_float=True)
+            self.assertEqual(loaded_data[0][0], 0.5)
+            self.assertTrue(np.isnan(loaded_data[0][1]))
+            self.assertEqual(loaded_data[1], [2.0, 3.0])
+
+    def test_load_all_keeps_na_strings(self):
+        with TestTeardownFile(self.test_path):
+            with open(self.test_path, 'w') as file:
+                file.write("nan|NA\nNone|null\n")
+
+            csv_writer = file_op.CSV_Writer(self.test_path)
+            self.assertEqual(csv_writer.load_all(), [['nan', 'NA'], ['None', 'null']])
 
 
 class TestParentDirPath(unittest.TestCase):
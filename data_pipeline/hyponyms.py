@@ -1,7 +1,7 @@
 from __future__ import annotations
 import random
 from warnings import warn
-from typing import Dict
+from typing import Dict, Iterable
 
 import math
 import numpy as np
@@ -170,6 +170,10 @@ class DenseHyponymMatrices:
 
         return vector
 
+    def batch_lookup(self, words: Iterable[str]) -> Dict[str, np.array]:
+        """ safe_lookup of each unique word, keyed by word. Missing words map to None. """
+        return {word: self.safe_lookup(word) for word in set(words)}
+
     def remove_all_except(self, words: list) -> None:
         self.density_matrices = {key: value for key, value in self.density_matrices.items() if key in words}
         return None